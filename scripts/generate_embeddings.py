@@ -13,13 +13,15 @@ Usage:
 Requires OPENROUTER_API_KEY in .env file.
 """
 
-import json
+import asyncio
+import base64
 import os
 import sys
-import time
 from pathlib import Path
 
-import requests
+import aiohttp
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from tqdm import tqdm
 
@@ -30,45 +32,94 @@ MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # 384 dims, 100% on tests
 BATCH_SIZE = 100  # OpenRouter limit per request
 OUTPUT_FILE = "src/data/words.json"
 OPENROUTER_URL = "https://openrouter.ai/api/v1/embeddings"
+MAX_CONCURRENT_REQUESTS = 8  # Batches in flight at once
+REQUESTS_PER_SECOND = 10  # Pace request starts to stay under the rate limit
 
 
 def load_current_words() -> list[str]:
     """Load current word list (already filtered by TWL)."""
-    with open("src/data/words.json") as f:
-        data = json.load(f)
+    with open("src/data/words.json", "rb") as f:
+        data = orjson.loads(f.read())
     return data["words"]
 
 
-def get_embeddings_batch(words: list[str], api_key: str) -> dict[str, list[float]]:
-    """Fetch embeddings for a batch of words."""
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
+async def get_embeddings_batch(
+    session: aiohttp.ClientSession, words: list[str]
+) -> list[list[float]]:
+    """Fetch embeddings for a batch of words, one per word in order."""
     payload = {
         "model": MODEL,
         "input": words,
     }
 
-    response = requests.post(OPENROUTER_URL, headers=headers, json=payload)
-    response.raise_for_status()
+    async with session.post(OPENROUTER_URL, json=payload) as response:
+        if not response.ok:
+            # Keep the response body on the error for the caller to report
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=(await response.text())[:500],
+            )
+        data = await response.json()
 
-    data = response.json()
+    return [item["embedding"] for item in data["data"]]
 
-    result = {}
-    for i, item in enumerate(data["data"]):
-        result[words[i]] = item["embedding"]
 
-    return result
+async def fetch_all_embeddings(words: list[str], api_key: str) -> np.ndarray:
+    """Fetch embeddings for all words, running batches concurrently.
 
-
-def normalize_and_round(vector: list[float], decimals: int = 4) -> list[float]:
-    """Normalize to unit length and round for smaller file size."""
-    magnitude = sum(x ** 2 for x in vector) ** 0.5
-    if magnitude > 0:
-        return [round(x / magnitude, decimals) for x in vector]
-    return vector
+    Returns a float32 matrix whose rows follow the order of words.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    # Allocated once the first batch tells us the dimensions; every batch
+    # then writes straight into its own rows
+    mat = None
+
+    async def fetch_batch(session: aiohttp.ClientSession, k: int) -> None:
+        nonlocal mat
+        # Give each batch its own start slot so requests are spread out evenly
+        await asyncio.sleep(max(0.0, start + k / REQUESTS_PER_SECOND - loop.time()))
+        i = k * BATCH_SIZE
+        batch = words[i:i + BATCH_SIZE]
+        async with sem:
+            try:
+                embeddings = await get_embeddings_batch(session, batch)
+            except aiohttp.ClientResponseError as e:
+                print(f"\nERROR at batch {i}: HTTP {e.status}")
+                print(f"Response: {e.message}")
+                raise
+        # Rows of mat are uninitialized until written, so a short batch
+        # must not pass silently
+        if len(embeddings) != len(batch):
+            raise ValueError(
+                f"Batch {i}: got {len(embeddings)} embeddings for {len(batch)} words"
+            )
+        if mat is None:
+            mat = np.empty((len(words), len(embeddings[0])), dtype=np.float32)
+        mat[i:i + len(batch)] = embeddings
+        progress.update()
+
+    n_batches = (len(words) + BATCH_SIZE - 1) // BATCH_SIZE
+    # The task group cancels the remaining batches as soon as one fails, and
+    # waits for them before the session closes under them
+    try:
+        with tqdm(total=n_batches, desc="Batches") as progress:
+            async with aiohttp.ClientSession(headers=headers) as session:
+                async with asyncio.TaskGroup() as tg:
+                    for k in range(n_batches):
+                        tg.create_task(fetch_batch(session, k))
+    except ExceptionGroup as eg:
+        # Surface the batch's own error, which is what callers catch
+        raise eg.exceptions[0]
+
+    return mat
 
 
 def main():
@@ -88,47 +139,40 @@ def main():
 
     # Fetch embeddings in batches
     print(f"\nFetching embeddings (batch size {BATCH_SIZE})...")
-    all_embeddings = {}
-
-    for i in tqdm(range(0, len(words), BATCH_SIZE), desc="Batches"):
-        batch = words[i:i + BATCH_SIZE]
-
-        try:
-            embeddings = get_embeddings_batch(batch, api_key)
-            all_embeddings.update(embeddings)
-        except requests.exceptions.HTTPError as e:
-            print(f"\nERROR at batch {i}: {e}")
-            print(f"Response: {e.response.text[:500]}")
-            sys.exit(1)
-
-        # Small delay to avoid rate limiting
-        time.sleep(0.1)
+    try:
+        mat = asyncio.run(fetch_all_embeddings(words, api_key))
+    except aiohttp.ClientResponseError:
+        sys.exit(1)
 
-    print(f"\nGot {len(all_embeddings):,} embeddings")
-    dims = len(next(iter(all_embeddings.values())))
+    print(f"\nGot {len(mat):,} embeddings")
+    dims = mat.shape[1]
     print(f"  Dimensions: {dims}")
 
-    # Normalize vectors
+    # Normalize to unit length and store as float16 for smaller file size.
+    # int8 is too coarse here: 384-d components are mostly within +-0.1, and
+    # int8 rounding reorders the neighbour ranks players see
     print("\nNormalizing vectors...")
-    for word in all_embeddings:
-        all_embeddings[word] = normalize_and_round(all_embeddings[word])
+    norms = np.sqrt(np.einsum("ij,ij->i", mat, mat))[:, None]
+    mat /= np.where(norms > 0, norms, 1)
+    q = mat.astype("<f2")
 
     # Save
     output_path = Path(OUTPUT_FILE)
     print(f"\nSaving to {output_path}...")
 
-    # Maintain word order from original list
-    vectors = [all_embeddings[w] for w in words]
-
+    # The float16 matrix ships row-major (little-endian) as one base64 blob
     data = {
         "words": words,
-        "vectors": vectors,
+        "vectors_b64": base64.b64encode(q.tobytes()).decode("ascii"),
+        "shape": list(q.shape),
+        "scale": 1.0,
+        "dtype": "float16",
         "model": MODEL,
         "dimensions": dims,
     }
 
-    with open(output_path, "w") as f:
-        json.dump(data, f, separators=(",", ":"))
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(data))
 
     size_mb = output_path.stat().st_size / (1024 * 1024)
     print(f"  Saved {len(words):,} words ({size_mb:.2f} MB)")
@@ -138,12 +182,13 @@ def main():
     print(f"  First 5 words: {words[:5]}")
     print(f"  Last 5 words: {words[-5:]}")
 
-    # Quick similarity test
+    # Quick similarity test, on the float16 vectors as shipped
     def cosine_sim(a, b):
-        return sum(x * y for x, y in zip(a, b))
+        return float(np.dot(a, b))
 
-    if "king" in all_embeddings and "queen" in all_embeddings:
-        sim = cosine_sim(all_embeddings["king"], all_embeddings["queen"])
+    word2idx = {w: i for i, w in enumerate(words)}
+    if "king" in word2idx and "queen" in word2idx:
+        sim = cosine_sim(q[word2idx["king"]].astype(np.float32), q[word2idx["queen"]].astype(np.float32))
         print(f"  king-queen similarity: {sim:.4f}")
 
     print("\n" + "=" * 60)
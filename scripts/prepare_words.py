@@ -10,7 +10,7 @@ for the word distance game. It handles:
 4. Outputting a compact JSON file for the web app
 
 Word Deduplication Strategy:
-- We use Porter stemming to group words with the same stem
+- We use Snowball (Porter2) stemming to group words with the same stem
 - For each group, we select the most "canonical" word form (typically the shortest
   or most common one)
 - The vector for the group is the vector of the selected canonical word
@@ -28,13 +28,20 @@ intuitive results for the game.
 
 import os
 import sys
-import json
+import asyncio
+import base64
 import gzip
+import hashlib
+import json
+import mmap
 import zipfile
+import urllib.error
 import urllib.request
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import re
+import numpy as np
 from tqdm import tqdm
 
 # Try to import nltk for stemming, fall back to simple stemming if not available
@@ -46,6 +53,43 @@ except ImportError:
     NLTK_AVAILABLE = False
     print("NLTK not available. Using simple stemming. Install with: pip install nltk")
 
+# Try to import a Snowball stemmer - PyStemmer (C) first, then snowballstemmer (pure Python,
+# but it uses PyStemmer when installed) - fall back to NLTK if neither is available
+try:
+    from Stemmer import Stemmer as SnowballStemmer
+    SNOWBALL_AVAILABLE = True
+except ImportError:
+    try:
+        from snowballstemmer import stemmer as SnowballStemmer
+        SNOWBALL_AVAILABLE = True
+    except ImportError:
+        SNOWBALL_AVAILABLE = False
+        print("PyStemmer not available. Using slower stemming. Install with: pip install PyStemmer")
+
+# Try to import rapidfuzz for fast edit distance, fall back to pure Python if not available
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    print("rapidfuzz not available. Using slow edit distance. Install with: pip install rapidfuzz")
+
+# Try to import numba to compile the similarity dedup scan, fall back to Python if not available
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("numba not available. Using slow similarity dedup. Install with: pip install numba")
+
+# Try to import aiohttp for parallel ranged downloads, fall back to urllib if not available
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("aiohttp not available. Using single-connection download. Install with: pip install aiohttp")
+
 # Configuration - Using GloVe 2024 Wikipedia+Gigaword embeddings (50d)
 # Available at: https://nlp.stanford.edu/projects/glove/
 GLOVE_URL = "https://nlp.stanford.edu/data/wordvecs/glove.2024.wikigiga.50d.zip"
@@ -54,106 +98,347 @@ TARGET_WORD_COUNT = 15000  # Aim for ~15k words after filtering
 MIN_WORD_LENGTH = 3  # Words must be at least 3 characters
 MAX_WORD_LENGTH = 15
 VECTOR_DIMENSIONS = 50
+DOWNLOAD_CONNECTIONS = 8  # Parallel HTTP range requests for the GloVe zip
+GLOVE_BLOCK_SIZE = 16 * 1024 * 1024  # Bytes of GloVe text handed to a parser at a time
+WORKERS = os.cpu_count() or 1  # Processes for parallel GloVe parsing and dedup
+GLOVE_INITIAL_ROWS = 1 << 18  # Starting capacity when the number of GloVe rows is unknown
+QUANTIZE_LEVELS = 127  # The largest |component| maps to int8 ±127
 
 # Words to exclude (profanity, slurs, very obscure terms)
-EXCLUDE_WORDS = {
+EXCLUDE_WORDS = frozenset({
     # Add any words you want to exclude here
     'xxx', 'etc'
-}
+})
+
+# Compound words: two lowercase parts joined by a single hyphen
+HYPHENATED_RE = re.compile(r'[a-z]+-[a-z]+\Z')
 
 # Common word suffixes for simple stemming fallback
 COMMON_SUFFIXES = ['ing', 'ed', 'er', 'est', 'ly', 's', 'es', 'ment', 'ness', 'tion', 'sion']
+SUFFIXES_LONGEST_FIRST = tuple(sorted(COMMON_SUFFIXES, key=len, reverse=True))
+# The lazy stem stops at the longest suffix that still leaves 3+ letters
+SUFFIX_RE = re.compile(r'(.{3,}?)(?:' + '|'.join(SUFFIXES_LONGEST_FIRST) + r')')
 
 
 def simple_stem(word):
     """Simple stemming fallback when NLTK is not available."""
     word = word.lower()
-    for suffix in sorted(COMMON_SUFFIXES, key=len, reverse=True):
-        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
-            return word[:-len(suffix)]
-    return word
+    # One C-level check rejects words with none of the suffixes
+    if not word.endswith(SUFFIXES_LONGEST_FIRST):
+        return word
+    match = SUFFIX_RE.fullmatch(word)
+    return match.group(1) if match else word
 
 
-def edit_distance(s1, s2):
-    """Compute Levenshtein edit distance between two strings."""
+def edit_distance(s1, s2, cutoff=None):
+    """
+    Compute Levenshtein edit distance between two strings.
+
+    If cutoff is given, only cells within cutoff of the diagonal are computed
+    (any path leaving that band costs more) and distances above the cutoff are
+    reported as cutoff + 1, stopping as soon as that is certain.
+    """
     if len(s1) < len(s2):
-        return edit_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-
-    prev_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        curr_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = prev_row[j + 1] + 1
-            deletions = curr_row[j] + 1
-            substitutions = prev_row[j] + (c1 != c2)
-            curr_row.append(min(insertions, deletions, substitutions))
+        s1, s2 = s2, s1
+    if cutoff is None:
+        cutoff = len(s1)
+    over = cutoff + 1
+    if len(s1) - len(s2) > cutoff:
+        return over
+
+    prev_row = [j if j <= cutoff else over for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1, 1):
+        lo = max(1, i - cutoff)
+        hi = min(len(s2), i + cutoff)
+        curr_row = [over] * (len(s2) + 1)
+        if i <= cutoff:
+            curr_row[0] = i
+        for j in range(lo, hi + 1):
+            insertions = prev_row[j] + 1
+            deletions = curr_row[j - 1] + 1
+            substitutions = prev_row[j - 1] + (c1 != s2[j - 1])
+            curr_row[j] = min(insertions, deletions, substitutions)
+
+        # Row minimums never decrease, so the distance can only go up from here
+        if min(curr_row[lo - 1:hi + 1]) > cutoff:
+            return over
         prev_row = curr_row
-    return prev_row[-1]
+    return min(prev_row[-1], over)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _banded_edit_distance(s1, s2, cutoff, prev_row, curr_row):
+        """edit_distance(s1, s2, cutoff) on code point arrays, using scratch rows."""
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        over = cutoff + 1
+        if len(s1) - len(s2) > cutoff:
+            return over
+
+        for j in range(len(s2) + 1):
+            prev_row[j] = j if j <= cutoff else over
+        for i in range(1, len(s1) + 1):
+            lo = max(1, i - cutoff)
+            hi = min(len(s2), i + cutoff)
+            curr_row[0] = i if i <= cutoff else over
+            curr_row[lo - 1] = curr_row[0] if lo == 1 else over
+            row_min = curr_row[lo - 1]
+            for j in range(lo, hi + 1):
+                d = min(prev_row[j] + 1, curr_row[j - 1] + 1,
+                        prev_row[j - 1] + (s1[i - 1] != s2[j - 1]))
+                curr_row[j] = d
+                row_min = min(row_min, d)
+            # The next row reads one cell past this band
+            if hi < len(s2):
+                curr_row[hi + 1] = over
+
+            if row_min > cutoff:
+                return over
+            prev_row, curr_row = curr_row, prev_row
+        return min(prev_row[len(s2)], over)
+
+    # fastmath lets the dot product loop below vectorize
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _scan_similar_pairs(chars, lens, V, word_bigram_ptr, word_bigram_ids, postings_ptr,
+                            postings, spelling_threshold, semantic_threshold,
+                            fill, offsets, matches, counts, checked):
+        """
+        For every word i, count (and if fill, write out) the j > i that pass
+        the same filters as find_similar_pairs, in parallel over i.
+        """
+        n = len(lens)
+        for i in prange(n):
+            # The fill pass only revisits words that have matches
+            if fill and counts[i] == 0:
+                continue
+            prev_row = np.empty(chars.shape[1] + 1, dtype=np.int32)
+            curr_row = np.empty(chars.shape[1] + 1, dtype=np.int32)
+            b1 = word_bigram_ids[word_bigram_ptr[i]:word_bigram_ptr[i + 1]]
+
+            # Gather j > i of similar length from the postings of each bigram
+            total = 0
+            for g in b1:
+                total += postings_ptr[g + 1] - postings_ptr[g]
+            cand = np.empty(total, dtype=np.int32)
+            m = 0
+            for g in b1:
+                plist = postings[postings_ptr[g]:postings_ptr[g + 1]]
+                for q in range(np.searchsorted(plist, i, side='right'), len(plist)):
+                    j = plist[q]
+                    if abs(lens[j] - lens[i]) <= spelling_threshold:
+                        cand[m] = j
+                        m += 1
+            cand = np.sort(cand[:m])
+
+            found = 0
+            n_checked = 0
+            k = 0
+            while k < m:
+                # j is listed once per bigram it shares with word i, so the
+                # length of its run is the bigram overlap
+                j = cand[k]
+                run_start = k
+                while k < m and cand[k] == j:
+                    k += 1
+                overlap = k - run_start
+                n_bigrams_j = word_bigram_ptr[j + 1] - word_bigram_ptr[j]
+                if overlap < max(1, min(len(b1), n_bigrams_j) - spelling_threshold - 1):
+                    continue
+
+                n_checked += 1
+
+                # Meaning first: most candidates fail it, and it is cheaper
+                sim = np.float32(0.0)
+                for d in range(V.shape[1]):
+                    sim += V[i, d] * V[j, d]
+                if sim < semantic_threshold:
+                    continue
+
+                dist = _banded_edit_distance(chars[i, :lens[i]], chars[j, :lens[j]],
+                                             spelling_threshold, prev_row, curr_row)
+                if dist <= spelling_threshold:
+                    if fill:
+                        matches[offsets[i] + found] = j
+                    found += 1
+
+            counts[i] = found
+            checked[i] = n_checked
+
+
+def print_download_progress(downloaded, total_size):
+    percent = min(100, downloaded * 100 / total_size)
+    sys.stdout.write(f"\rProgress: {percent:.1f}% ({downloaded // (1024*1024)}MB / {total_size // (1024*1024)}MB)")
+    sys.stdout.flush()
+
+
+async def download_range(session, url, fd, start, end, progress):
+    """Download bytes start..end (inclusive) of url into fd at the same offset."""
+    async with session.get(url, headers={'Range': f'bytes={start}-{end}'}) as response:
+        response.raise_for_status()
+        if response.status != 206:
+            raise ValueError(f"Server ignored range request for {url}")
+        offset = start
+        async for chunk in response.content.iter_chunked(1 << 20):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            progress(len(chunk))
+    if offset != end + 1:
+        raise ValueError(f"Short read for bytes {start}-{end} of {url}")
+
+
+async def download_parallel(url, path):
+    """
+    Download url to path over several connections using HTTP range requests.
+
+    Returns False without writing anything if the server does not support
+    ranges, so the caller can fall back to a plain download.
+    """
+    # No overall deadline, since a range of a large file can take a long
+    # time on a slow link; only a stalled connection gives up
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.head(url, allow_redirects=True) as response:
+            response.raise_for_status()
+            total_size = response.content_length
+            accepts_ranges = response.headers.get('Accept-Ranges') == 'bytes'
+            url = str(response.url)  # Skip the redirect on every range request
+
+        if not total_size or not accepts_ranges:
+            return False
+
+        downloaded = 0
+
+        def progress(n):
+            nonlocal downloaded
+            downloaded += n
+            print_download_progress(downloaded, total_size)
+
+        part_size = -(-total_size // DOWNLOAD_CONNECTIONS)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, total_size)
+            await asyncio.gather(*(
+                download_range(session, url, fd, start, min(start + part_size, total_size) - 1, progress)
+                for start in range(0, total_size, part_size)
+            ))
+        finally:
+            os.close(fd)
+
+    return True
+
+
+def download_resumable(url, path):
+    """
+    Stream url into path over one connection, 1MB at a time.
+
+    If path already holds the start of the file, only the rest is requested
+    (HTTP Range); a server that answers with the whole file overwrites it.
+    Raises ContentTooShortError if the connection ends early, leaving path
+    in place for the next call to resume.
+    """
+    offset = path.stat().st_size if path.exists() else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=headers))
+    except urllib.error.HTTPError as e:
+        # Nothing left to fetch past offset, so the partial file can't be trusted
+        if e.code != 416:
+            raise
+        path.unlink()
+        return download_resumable(url, path)
+
+    with response, open(path, 'ab' if response.status == 206 else 'wb') as f:
+        downloaded = offset if response.status == 206 else 0
+        if downloaded:
+            print(f"Resuming at {downloaded // (1024*1024)}MB")
+        # A 206 names the full size in Content-Range ("bytes 100-199/200")
+        content_range = response.headers.get('Content-Range', '')
+        if response.status == 206 and content_range.rpartition('/')[2].isdigit():
+            total_size = int(content_range.rpartition('/')[2])
+        else:
+            total_size = downloaded + int(response.headers.get('Content-Length', 0))
+
+        while True:
+            chunk = response.read(1 << 20)
+            if not chunk:
+                break
+            f.write(chunk)
+            downloaded += len(chunk)
+            if total_size:
+                print_download_progress(downloaded, total_size)
 
+    if total_size and downloaded != total_size:
+        raise urllib.error.ContentTooShortError(
+            f"Got {downloaded:,} of {total_size:,} bytes from {url}; run again to resume", None)
 
-def cosine_similarity(v1, v2):
-    """Compute cosine similarity between two vectors."""
-    dot = sum(a * b for a, b in zip(v1, v2))
-    norm1 = sum(a * a for a in v1) ** 0.5
-    norm2 = sum(b * b for b in v2) ** 0.5
-    if norm1 == 0 or norm2 == 0:
-        return 0
-    return dot / (norm1 * norm2)
+
+def check_zip(path):
+    """Raise zipfile.BadZipFile unless every member of the zip matches its CRC-32."""
+    with zipfile.ZipFile(path) as zip_ref:
+        bad = zip_ref.testzip()
+    if bad is not None:
+        raise zipfile.BadZipFile(f"{path}: CRC mismatch in {bad}")
 
 
 def download_glove(data_dir):
-    """Download GloVe embeddings if not already present."""
+    """
+    Download the GloVe zip if not already present and return its path.
+
+    The zip is never extracted; parse_glove_file reads the text straight
+    out of it. A download is only renamed to the zip once check_zip
+    confirms its CRCs, so a zip already on disk is trusted as is.
+    """
     data_dir = Path(data_dir)
     data_dir.mkdir(parents=True, exist_ok=True)
 
-    import zipfile
-
     # Derive zip filename from URL
     zip_name = GLOVE_URL.split('/')[-1]
     zip_path = data_dir / zip_name
 
-    # Download if needed
+    # Download if needed. Data goes to a temporary file that is only renamed
+    # once complete, so an interrupted run never leaves a truncated zip
     if not zip_path.exists():
         print(f"Downloading from {GLOVE_URL}...")
+        # Single-stream downloads write a prefix of the file, so they can be
+        # resumed; parallel ranges land out of order and are restarted
+        part_path = data_dir / f"{zip_name}.part"
+        ranges_path = data_dir / f"{zip_name}.ranges"
+
+        done = False
+        if not part_path.exists() and AIOHTTP_AVAILABLE:
+            try:
+                done = asyncio.run(download_parallel(GLOVE_URL, ranges_path))
+                if done:
+                    check_zip(ranges_path)
+            except Exception as e:
+                done = False
+                print(f"\nParallel download failed ({e!r}), retrying over one connection")
+
+        if done:
+            ranges_path.rename(zip_path)
+        else:
+            ranges_path.unlink(missing_ok=True)
+            download_resumable(GLOVE_URL, part_path)
+            try:
+                check_zip(part_path)
+            except zipfile.BadZipFile:
+                # Resuming would keep the bad bytes, so start over next time
+                part_path.unlink()
+                raise
+            part_path.rename(zip_path)
 
-        def progress_hook(block_num, block_size, total_size):
-            if total_size > 0:
-                downloaded = block_num * block_size
-                percent = min(100, downloaded * 100 / total_size)
-                sys.stdout.write(f"\rProgress: {percent:.1f}% ({downloaded // (1024*1024)}MB / {total_size // (1024*1024)}MB)")
-                sys.stdout.flush()
-
-        urllib.request.urlretrieve(GLOVE_URL, zip_path, progress_hook)
         print("\nDownload complete!")
+    else:
+        print(f"Already downloaded: {zip_path}")
 
-    # Find and extract the txt file from the zip
-    print(f"Opening {zip_path}...")
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        # List contents and find the txt file
-        txt_files = [f for f in zip_ref.namelist() if f.endswith('.txt')]
-        if not txt_files:
-            raise ValueError(f"No .txt file found in {zip_path}")
-
-        txt_name = txt_files[0]
-        txt_path = data_dir / txt_name
-
-        if not txt_path.exists():
-            print(f"Extracting {txt_name}...")
-            zip_ref.extract(txt_name, data_dir)
-            print("Extraction complete!")
-        else:
-            print(f"Already extracted: {txt_path}")
-
-    return txt_path
+    return zip_path
 
 
 def is_valid_word(word):
     """Check if a word should be included in the game."""
-    # Must be alphabetic (allow hyphens for compound words)
-    if not re.match(r'^[a-z]+(-[a-z]+)?$', word):
-        return False
+    # Cheapest checks first: this runs once per GloVe line
 
     # Length constraints
     if len(word) < MIN_WORD_LENGTH or len(word) > MAX_WORD_LENGTH:
@@ -163,179 +448,501 @@ def is_valid_word(word):
     if word in EXCLUDE_WORDS:
         return False
 
-    return True
+    # Must be alphabetic (allow hyphens for compound words). Plain words are
+    # checked with C string methods; only hyphenated ones go through the regex.
+    if word.isascii() and word.isalpha():
+        return word.islower()
+    if '-' not in word:
+        return False
+    return HYPHENATED_RE.match(word) is not None
 
 
-def load_glove_embeddings(glove_path, max_words=None):
-    """Load GloVe embeddings from file."""
-    print(f"Loading GloVe embeddings from {glove_path}...")
+def iter_glove_blocks(glove_path):
+    """
+    Yield the GloVe text in blocks of about GLOVE_BLOCK_SIZE bytes, each
+    cut at a line break so it holds whole lines.
+
+    A .txt file is memory-mapped. For a .zip the text member is
+    decompressed as a stream, so it never touches the disk.
+    """
+    glove_path = Path(glove_path)
+
+    if glove_path.suffix != '.zip':
+        with open(glove_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < len(mm):
+                cut = mm.find(b'\n', pos + GLOVE_BLOCK_SIZE)
+                cut = len(mm) if cut < 0 else cut + 1
+                yield mm[pos:cut]
+                pos = cut
+        return
+
+    with zipfile.ZipFile(glove_path) as zip_ref:
+        txt_files = [f for f in zip_ref.namelist() if f.endswith('.txt')]
+        if not txt_files:
+            raise ValueError(f"No .txt file found in {glove_path}")
+
+        with zip_ref.open(txt_files[0]) as f:
+            tail = b''
+            while True:
+                block = f.read(GLOVE_BLOCK_SIZE)
+                if not block:
+                    break
+                block = tail + block
+                cut = block.rfind(b'\n') + 1
+                tail = block[cut:]
+                if cut:
+                    yield block[:cut]
+            if tail:
+                yield tail
+
+
+def parse_glove_block(buf):
+    """
+    Parse a block of whole GloVe lines.
+
+    Returns (tokens, vectors, line_numbers, n_lines): the kept tokens, their
+    vectors, the 1-based line number of each within the block, and the
+    number of lines in the block. Tokens are lowercased; lines with too few
+    dimensions are skipped.
+    """
+    # Every number takes at least two bytes ("0 "), which bounds the row count
+    capacity = len(buf) // (2 * VECTOR_DIMENSIONS) + 1
+    vectors = np.empty((capacity, VECTOR_DIMENSIONS), dtype=np.float32)
+    line_numbers = np.empty(capacity, dtype=np.int64)
+    tokens = []
+
+    # Scan for line breaks and hand each line's number bytes straight to
+    # NumPy, rather than decoding and splitting every line
+    pos = 0
+    i = 0
+    while pos < len(buf):
+        end = buf.find(b'\n', pos)
+        if end < 0:
+            end = len(buf)
+        sp = buf.find(b' ', pos, end)
+        line_start, pos = pos, end + 1
+        i += 1
+
+        if sp <= line_start:
+            continue
+
+        try:
+            # Parse the numbers in C rather than one float() per value
+            vector = np.fromstring(buf[sp + 1:end], sep=' ', dtype=np.float32)
+        except ValueError:
+            continue
+        # Accept vectors of the expected dimension or close to it
+        if len(vector) < VECTOR_DIMENSIONS:
+            continue
+
+        vectors[len(tokens)] = vector[:VECTOR_DIMENSIONS]
+        line_numbers[len(tokens)] = i
+        tokens.append(buf[line_start:sp].decode('utf-8').lower())
+
+    return tokens, vectors[:len(tokens)], line_numbers[:len(tokens)], i
+
+
+def limit_glove_blocks(blocks, max_lines):
+    """Pass blocks through until they hold at least max_lines lines."""
+    n_lines = 0
+    for buf in blocks:
+        yield buf
+        # Counted in C here, so the pool is never handed blocks past the budget
+        n_lines += buf.count(b'\n') + (not buf.endswith(b'\n'))
+        if n_lines >= max_lines:
+            return
+
+
+def parse_blocks_in_pool(pool, blocks, depth):
+    """Like map(parse_glove_block, blocks), keeping up to depth blocks in flight."""
+    pending = deque()
+    for buf in blocks:
+        pending.append(pool.submit(parse_glove_block, buf))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def parse_glove_file(glove_path, max_words=None):
+    """
+    Parse a GloVe text (or zipped text) file into (tokens, vectors) without
+    filtering words, reading only the first max_words lines if given.
 
-    embeddings = {}
-    with open(glove_path, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if max_words and i >= max_words:
+    Blocks of lines are parsed in WORKERS processes and copied back
+    in file order into one matrix, which is sized for max_words up front or
+    else doubled in place as needed.
+    """
+    tokens = []
+    vectors = np.empty((max_words or GLOVE_INITIAL_ROWS, VECTOR_DIMENSIONS), dtype=np.float32)
+    n_lines = 0
+
+    def append_rows(rows):
+        n = len(tokens)
+        if n + len(rows) > len(vectors):
+            vectors.resize((max(2 * len(vectors), n + len(rows)), VECTOR_DIMENSIONS), refcheck=False)
+        vectors[n:n + len(rows)] = rows
+
+    pool = ProcessPoolExecutor(WORKERS) if WORKERS > 1 else None
+    try:
+        blocks = iter_glove_blocks(glove_path)
+        if max_words:
+            blocks = limit_glove_blocks(blocks, max_words)
+        if pool:
+            results = parse_blocks_in_pool(pool, blocks, 2 * WORKERS)
+        else:
+            results = map(parse_glove_block, blocks)
+
+        for block_tokens, block_vectors, line_numbers, block_lines in results:
+            if max_words and n_lines + block_lines >= max_words:
+                # Keep only the rows that fall within the line budget
+                keep = np.searchsorted(line_numbers, max_words - n_lines, side='right')
+                append_rows(block_vectors[:keep])
+                tokens.extend(block_tokens[:keep])
+                n_lines = max_words
                 break
 
-            parts = line.strip().split()
-            if len(parts) < 2:
-                continue
+            append_rows(block_vectors)
+            tokens.extend(block_tokens)
+            n_lines += block_lines
+            print(f"  Processed {n_lines:,} lines...")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
-            word = parts[0].lower()
+    # Give back the unused capacity
+    vectors.resize((len(tokens), VECTOR_DIMENSIONS), refcheck=False)
+    return tokens, vectors
 
-            if is_valid_word(word):
-                try:
-                    vector = [float(x) for x in parts[1:]]
-                    # Accept vectors of the expected dimension or close to it
-                    if len(vector) >= VECTOR_DIMENSIONS:
-                        embeddings[word] = vector[:VECTOR_DIMENSIONS]
-                except ValueError:
-                    continue
 
-            if (i + 1) % 100000 == 0:
-                print(f"  Processed {i + 1:,} lines, kept {len(embeddings):,} words...")
+def load_glove_embeddings(glove_path, max_words=None):
+    """
+    Load GloVe embeddings from file.
+
+    Returns a (words, vectors) pair: the kept words in file order and a
+    float32 matrix whose rows are their vectors, scaled to unit length so
+    every later step can use dot product as cosine similarity.
+
+    The parsed file is cached next to it as .npz, so reruns skip the text
+    parse. Word filtering is applied after the cache, so changing the
+    filter never needs a re-parse.
+    """
+    glove_path = Path(glove_path)
+    cache_path = glove_path.with_name(f"{glove_path.stem}.{max_words or 'all'}.npz")
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= glove_path.stat().st_mtime:
+        print(f"Loading cached GloVe embeddings from {cache_path}...")
+        with np.load(cache_path) as cache:
+            tokens = cache['words'].tolist()
+            all_vectors = cache['vectors']
+    else:
+        print(f"Loading GloVe embeddings from {glove_path}...")
+        tokens, all_vectors = parse_glove_file(glove_path, max_words)
+        # Written aside and renamed into place, so an interrupted run never
+        # leaves a partial cache that looks fresh
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, words=np.array(tokens), vectors=all_vectors)
+        os.replace(tmp_path, cache_path)
 
-    print(f"Loaded {len(embeddings):,} valid word embeddings")
-    return embeddings
+    # A repeated word keeps its first position but takes the later vector
+    rows = {}
+    for i, word in enumerate(tokens):
+        if is_valid_word(word):
+            rows[word] = i
 
+    words = list(rows)
+    vectors = all_vectors[list(rows.values())]
+
+    # Normalize in place, once, for the whole pipeline
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1)
+
+    print(f"Loaded {len(words):,} valid word embeddings")
+    return words, vectors
+
+
+def stem_words(words, cache_dir=None):
+    """
+    Stem every word with the best available stemmer.
 
-def deduplicate_by_stem(embeddings):
+    If cache_dir is given, the stems are saved there keyed by a hash of the
+    stemmer and the word list, and reused by later runs on the same words.
+    """
+    if SNOWBALL_AVAILABLE:
+        backend = 'snowball'
+    elif NLTK_AVAILABLE:
+        backend = 'nltk'
+    else:
+        backend = 'simple'
+
+    cache_path = None
+    if cache_dir:
+        key = hashlib.sha256('\n'.join([backend, *words]).encode('utf-8')).hexdigest()[:16]
+        cache_path = Path(cache_dir) / f"stems-{key}.npy"
+        if cache_path.exists():
+            print(f"  Using cached stems from {cache_path}")
+            return np.load(cache_path)
+
+    if backend == 'snowball':
+        # Whole list in one call, so PyStemmer stays in C between words
+        stems = SnowballStemmer('english').stemWords(words)
+    elif backend == 'nltk':
+        stemmer = PorterStemmer()
+        stems = list(map(stemmer.stem, words))
+    else:
+        stems = list(map(simple_stem, words))
+    stems = np.array(stems)
+
+    if cache_path:
+        # Renamed into place, so an interrupted run leaves no partial cache
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, stems)
+        os.replace(tmp_path, cache_path)
+    return stems
+
+
+def deduplicate_by_stem(words, vectors, max_words=None, cache_dir=None):
     """
     DEPRECATED: Use deduplicate_by_similarity instead.
 
     Group words by their stem and select a canonical representative.
+    If max_words is given, only the first max_words survivors are kept, so
+    their vectors are gathered once rather than copied and sliced again.
+    Stems are cached in cache_dir if given (see stem_words).
     """
     print("Deduplicating words by stem...")
 
-    if NLTK_AVAILABLE:
-        stemmer = PorterStemmer()
-        stem_func = stemmer.stem
-    else:
-        stem_func = simple_stem
+    # Stem every word once, then sort indices by stem and canonical preference
+    # (shorter, then alphabetical) so each stem group is one contiguous run
+    stems = stem_words(words, cache_dir)
+    lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+    order = np.lexsort((np.array(words), lengths, stems))
 
-    # Group words by stem
-    stem_groups = defaultdict(list)
-    for word in embeddings:
-        stem = stem_func(word)
-        stem_groups[stem].append(word)
+    sorted_stems = stems[order]
+    starts = np.flatnonzero(np.r_[True, sorted_stems[1:] != sorted_stems[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
 
-    # Select canonical word from each group
-    canonical_words = {}
-    for stem, words in stem_groups.items():
-        # Sort by length (prefer shorter), then alphabetically
-        words.sort(key=lambda w: (len(w), w))
-        canonical = words[0]
-        canonical_words[canonical] = embeddings[canonical]
+    # Keep the first word of each run, placed where its stem first appears
+    first_seen = np.minimum.reduceat(order, starts)
+    by_first_seen = np.argsort(first_seen)
+    keep_idx = order[starts[by_first_seen]]
 
-    print(f"Reduced from {len(embeddings):,} to {len(canonical_words):,} words after deduplication")
+    print(f"Reduced from {len(words):,} to {len(keep_idx):,} words after deduplication")
+    if max_words:
+        print(f"Keeping top {max_words:,} words...")
+        keep_idx = keep_idx[:max_words]
 
     # Show some examples of deduplication
     print("\nDeduplication examples:")
-    examples_shown = 0
-    for stem, words in stem_groups.items():
-        if len(words) > 2 and examples_shown < 5:
-            selected = sorted(words, key=lambda w: (len(w), w))[0]
-            removed = [w for w in words if w != selected][:5]
-            print(f"  Kept '{selected}', removed: {removed}")
-            examples_shown += 1
+    for g in by_first_seen[sizes[by_first_seen] > 2][:5]:
+        group = order[starts[g]:starts[g] + sizes[g]]
+        removed = [words[i] for i in group[1:6]]
+        print(f"  Kept '{words[group[0]]}', removed: {removed}")
 
-    return canonical_words
+    return [words[i] for i in keep_idx], vectors[keep_idx]
 
 
-def deduplicate_by_similarity(embeddings, spelling_threshold=2, semantic_threshold=0.85):
+def build_bigram_index(words):
     """
-    Merge words that are similar in BOTH spelling AND meaning.
+    Index the character bigrams (with ^/$ markers) of every word as flat arrays.
 
-    Uses n-gram blocking for efficient candidate generation - only compares
-    words that share character bigrams, which is required for low edit distance.
+    Returns (word_bigram_ptr, word_bigram_ids, postings_ptr, postings) in CSR
+    layout: word i's sorted bigram ids are
+    word_bigram_ids[word_bigram_ptr[i]:word_bigram_ptr[i + 1]], and the
+    ascending indices of the words containing bigram g are
+    postings[postings_ptr[g]:postings_ptr[g + 1]].
     """
-    print(f"Deduplicating by spelling+meaning similarity...")
-    print(f"  Spelling threshold: edit distance <= {spelling_threshold}")
-    print(f"  Semantic threshold: cosine similarity >= {semantic_threshold}")
-
-    words = list(embeddings.keys())
-    vectors = [embeddings[w] for w in words]
+    print("  Building bigram index...")
     n = len(words)
+    bigram_ids = {}
+    word_bigram_ids = []
+    word_bigram_ptr = [0]
+    for word in words:
+        padded = f"^{word}$"
+        ids = {bigram_ids.setdefault(padded[j:j+2], len(bigram_ids)) for j in range(len(padded) - 1)}
+        word_bigram_ids.extend(sorted(ids))
+        word_bigram_ptr.append(len(word_bigram_ids))
+    word_bigram_ids = np.array(word_bigram_ids, dtype=np.int32)
+    word_bigram_ptr = np.array(word_bigram_ptr, dtype=np.int64)
 
-    # Track which words to merge (using Union-Find)
-    parent = list(range(n))
+    # Invert to postings: word indices grouped by bigram id, ascending
+    owners = np.repeat(np.arange(n, dtype=np.int32), np.diff(word_bigram_ptr))
+    postings = owners[np.lexsort((owners, word_bigram_ids))]
+    postings_ptr = np.zeros(len(bigram_ids) + 1, dtype=np.int64)
+    postings_ptr[1:] = np.cumsum(np.bincount(word_bigram_ids, minlength=len(bigram_ids)))
 
-    def find(x):
-        if parent[x] != x:
-            parent[x] = find(parent[x])
-        return parent[x]
+    return word_bigram_ptr, word_bigram_ids, postings_ptr, postings
 
-    def union(x, y):
-        px, py = find(x), find(y)
-        if px != py:
-            parent[px] = py
 
-    # Build bigram index - words with edit distance ≤ 2 must share bigrams
-    print("  Building bigram index...")
-    bigram_index = defaultdict(set)
-    word_bigrams = {}
+def find_pairs_in_rows(rows, words, V, bigram_index, spelling_threshold, semantic_threshold):
+    """
+    Scan the given rows for similar pairs (i, j), i < j, using the arrays
+    from build_bigram_index. Returns (pairs, checked) for those rows.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        # C implementation that stops early once the cutoff is exceeded
+        def distance(s1, s2):
+            return Levenshtein.distance(s1, s2, score_cutoff=spelling_threshold)
+    else:
+        def distance(s1, s2):
+            return edit_distance(s1, s2, cutoff=spelling_threshold)
 
-    for i, word in enumerate(words):
-        # Get all character bigrams (including start/end markers)
-        padded = f"^{word}$"
-        bigrams = {padded[j:j+2] for j in range(len(padded) - 1)}
-        word_bigrams[i] = bigrams
-        for bg in bigrams:
-            bigram_index[bg].add(i)
+    word_bigram_ptr, word_bigram_ids, postings_ptr, postings = bigram_index
+    n_bigrams = np.diff(word_bigram_ptr)
+    lens = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
 
-    # Find similar pairs using bigram blocking
-    merge_count = 0
+    pairs = []
     checked = 0
-    seen_pairs = set()
 
-    for i in tqdm(range(n), desc="  Deduplicating", unit="words"):
+    for i in rows:
+        # Every word sharing a bigram with word i, listed once per shared bigram
+        ids = word_bigram_ids[word_bigram_ptr[i]:word_bigram_ptr[i + 1]].tolist()
+        cand = np.concatenate([postings[postings_ptr[g]:postings_ptr[g + 1]] for g in ids])
+
+        # Each unordered pair is only visited from its lower index, so no
+        # pair is ever checked twice. Lengths must be within the threshold.
+        cand = cand[cand > i]
+        cand = cand[np.abs(lens[cand] - lens[i]) <= spelling_threshold]
+
+        # Bigram overlap filter - need sufficient overlap for low edit distance.
+        # A word's repeat count is exactly its bigram overlap with word i.
+        cand, overlap = np.unique(cand, return_counts=True)
+        min_required = np.maximum(1, np.minimum(n_bigrams[i], n_bigrams[cand]) - spelling_threshold - 1)
+        cand = cand[overlap >= min_required]
+
+        if not len(cand):
+            continue
+        checked += len(cand)
+
+        # Check semantic similarity for all candidates in one matrix-vector
+        # product, so the per-pair edit distance only runs on the few that pass
+        sims = V[cand] @ V[i]
         word1 = words[i]
-        vec1 = vectors[i]
-        len1 = len(word1)
-        bg1 = word_bigrams[i]
-
-        # Get candidates: words sharing at least one bigram
-        # (words with edit dist ≤ 2 must share at least len-3 bigrams for len > 3)
-        candidates = set()
-        for bg in bg1:
-            candidates.update(bigram_index[bg])
-
-        for j in candidates:
-            if j <= i:
-                continue
+        for j in cand[sims >= semantic_threshold].tolist():
+            # Check spelling similarity
+            if distance(word1, words[j]) <= spelling_threshold:
+                pairs.append((i, j))
 
-            # Skip if already checked
-            pair = (i, j) if i < j else (j, i)
-            if pair in seen_pairs:
-                continue
-            seen_pairs.add(pair)
+    return pairs, checked
 
-            word2 = words[j]
 
-            # Quick length filter
-            if abs(len1 - len(word2)) > spelling_threshold:
-                continue
+def find_similar_pairs(words, V, spelling_threshold, semantic_threshold):
+    """
+    Find index pairs (i, j), i < j, that are close in spelling and meaning.
 
-            # Bigram overlap filter - need sufficient overlap for low edit distance
-            bg2 = word_bigrams[j]
-            overlap = len(bg1 & bg2)
-            min_required = max(1, min(len(bg1), len(bg2)) - spelling_threshold - 1)
-            if overlap < min_required:
-                continue
+    V must hold unit-length rows. Returns (pairs, checked), where checked
+    counts the pairs that passed the bigram filter. Rows are split across
+    WORKERS processes; each takes every WORKERS-th row, since low rows have
+    the most j > i to check.
+    """
+    # Words with edit distance ≤ 2 must share bigrams
+    bigram_index = build_bigram_index(words)
+    args = (words, V, bigram_index, spelling_threshold, semantic_threshold)
 
-            checked += 1
+    if WORKERS <= 1:
+        return find_pairs_in_rows(tqdm(range(len(words)), desc="  Deduplicating", unit="words"), *args)
 
-            # Check spelling similarity
-            edit_dist = edit_distance(word1, word2)
-            if edit_dist > spelling_threshold:
-                continue
+    pairs = []
+    checked = 0
+    with ProcessPoolExecutor(WORKERS) as pool:
+        futures = [pool.submit(find_pairs_in_rows, range(k, len(words), WORKERS), *args)
+                   for k in range(WORKERS)]
+        for future in tqdm(as_completed(futures), total=WORKERS, desc="  Deduplicating", unit="chunks"):
+            chunk_pairs, chunk_checked = future.result()
+            pairs.extend(chunk_pairs)
+            checked += chunk_checked
+
+    # Back to row order, as the single-process scan returns them
+    pairs.sort()
+    return pairs, checked
+
+
+def find_similar_pairs_jit(words, V, spelling_threshold, semantic_threshold):
+    """
+    Same as find_similar_pairs, but runs the scan as a parallel Numba kernel
+    over a padded character matrix and the flat bigram index.
+    """
+    n = len(words)
+    lens = np.fromiter(map(len, words), dtype=np.int32, count=n)
+    if n and all(map(str.isascii, words)):
+        # One byte per character, packed and zero-padded by NumPy in one call
+        chars = np.array(words, dtype=bytes).view(np.uint8).reshape(n, -1)
+    else:
+        chars = np.zeros((n, max(lens, default=0)), dtype=np.uint32)
+        for i, word in enumerate(words):
+            chars[i, :lens[i]] = np.frombuffer(word.encode('utf-32-le'), dtype=np.uint32)
+
+    word_bigram_ptr, word_bigram_ids, postings_ptr, postings = build_bigram_index(words)
+
+    print("  Scanning candidate pairs...")
+    V = np.ascontiguousarray(V, dtype=np.float32)
+    args = (chars, lens, V, word_bigram_ptr, word_bigram_ids, postings_ptr, postings,
+            spelling_threshold, semantic_threshold)
+
+    # First pass counts matches per word to size the output, second fills it
+    counts = np.zeros(n, dtype=np.int64)
+    checked = np.zeros(n, dtype=np.int64)
+    offsets = np.zeros(n, dtype=np.int64)
+    _scan_similar_pairs(*args, False, offsets, np.empty(0, dtype=np.int32), counts, checked)
+    offsets[1:] = np.cumsum(counts)[:-1]
+    matches = np.empty(counts.sum(), dtype=np.int32)
+    _scan_similar_pairs(*args, True, offsets, matches, counts, checked)
+
+    firsts = np.repeat(np.arange(n), counts)
+    return list(zip(firsts.tolist(), matches.tolist())), int(checked.sum())
+
+
+def deduplicate_by_similarity(words, vectors, spelling_threshold=2, semantic_threshold=0.85):
+    """
+    Merge words that are similar in BOTH spelling AND meaning.
+
+    Uses n-gram blocking for efficient candidate generation - only compares
+    words that share character bigrams, which is required for low edit distance.
+    Vectors must be unit length, as returned by load_glove_embeddings.
+    """
+    print(f"Deduplicating by spelling+meaning similarity...")
+    print(f"  Spelling threshold: edit distance <= {spelling_threshold}")
+    print(f"  Semantic threshold: cosine similarity >= {semantic_threshold}")
+
+    n = len(words)
+
+    if NUMBA_AVAILABLE:
+        pairs, checked = find_similar_pairs_jit(words, vectors, spelling_threshold, semantic_threshold)
+    else:
+        pairs, checked = find_similar_pairs(words, vectors, spelling_threshold, semantic_threshold)
 
-            # Check semantic similarity
-            sim = cosine_similarity(vec1, vectors[j])
-            if sim >= semantic_threshold:
-                union(i, j)
-                merge_count += 1
+    # Track which words to merge (using Union-Find)
+    parent = list(range(n))
+    rank = [0] * n
 
-    print(f"  Checked {checked:,} candidate pairs, found {merge_count:,} merges")
+    def find(x):
+        # Iterative, so long chains cannot hit the recursion limit
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point everything on the path at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x, y):
+        px, py = find(x), find(y)
+        if px == py:
+            return
+        # Union by rank: hang the shallower tree under the deeper one
+        if rank[px] < rank[py]:
+            px, py = py, px
+        parent[py] = px
+        if rank[px] == rank[py]:
+            rank[px] += 1
+
+    for i, j in pairs:
+        union(i, j)
+
+    print(f"  Checked {checked:,} candidate pairs, found {len(pairs):,} merges")
 
     # Group words by their root
     groups = defaultdict(list)
@@ -344,29 +951,27 @@ def deduplicate_by_similarity(embeddings, spelling_threshold=2, semantic_thresho
         groups[root].append(i)
 
     # Select canonical word from each group (shortest, then alphabetically first)
-    canonical_words = {}
+    keep_idx = []
     examples = []
 
     for root, indices in groups.items():
-        group_words = [words[i] for i in indices]
-        group_words.sort(key=lambda w: (len(w), w))
-        canonical = group_words[0]
-        canonical_words[canonical] = embeddings[canonical]
+        indices.sort(key=lambda i: (len(words[i]), words[i]))
+        keep_idx.append(indices[0])
 
-        if len(group_words) > 1 and len(examples) < 10:
-            examples.append((canonical, group_words[1:]))
+        if len(indices) > 1 and len(examples) < 10:
+            examples.append((words[indices[0]], [words[i] for i in indices[1:]]))
 
-    print(f"Reduced from {len(embeddings):,} to {len(canonical_words):,} words")
+    print(f"Reduced from {n:,} to {len(keep_idx):,} words")
 
     if examples:
         print("\nMerge examples:")
         for kept, removed in examples[:5]:
             print(f"  Kept '{kept}', merged: {removed[:5]}")
 
-    return canonical_words
+    return [words[i] for i in keep_idx], vectors[keep_idx]
 
 
-def select_top_words(embeddings, target_count):
+def select_top_words(words, vectors, target_count):
     """
     Select the top N words based on their position in GloVe (frequency proxy).
 
@@ -375,55 +980,47 @@ def select_top_words(embeddings, target_count):
     """
     print(f"Selecting top {target_count:,} words...")
 
-    # Convert to list to maintain order
-    word_list = list(embeddings.keys())[:target_count]
-
-    return {word: embeddings[word] for word in word_list}
-
+    return words[:target_count], vectors[:target_count]
 
-def normalize_vectors(embeddings):
-    """Normalize all vectors to unit length for consistent cosine similarity."""
-    print("Normalizing vectors...")
 
-    normalized = {}
-    for word, vector in embeddings.items():
-        magnitude = sum(x ** 2 for x in vector) ** 0.5
-        if magnitude > 0:
-            normalized[word] = [x / magnitude for x in vector]
-        else:
-            normalized[word] = vector
-
-    return normalized
-
-
-def reduce_precision(embeddings, decimal_places=4):
-    """Reduce vector precision to save space in JSON output."""
-    print(f"Reducing precision to {decimal_places} decimal places...")
+def quantize_vectors(vectors):
+    """
+    Quantize unit-length vectors to int8 to save space in JSON output.
 
-    reduced = {}
-    for word, vector in embeddings.items():
-        reduced[word] = [round(x, decimal_places) for x in vector]
+    Returns (q, scale), where q * scale approximates vectors. The scale comes
+    from the largest |component| rather than 1, since no component of a
+    unit vector in many dimensions gets near 1 and a fixed 1/127 would leave
+    most of the int8 range unused.
+    """
+    print("Quantizing vectors to int8...")
 
-    return reduced
+    scale = float(np.abs(vectors).max()) / QUANTIZE_LEVELS or 1.0
+    # Scale, round and clip in one scratch buffer instead of a temporary per step
+    q = np.divide(vectors, scale, dtype=np.float32)
+    np.rint(q, out=q)
+    np.clip(q, -QUANTIZE_LEVELS, QUANTIZE_LEVELS, out=q)
+    print(f"  Scale: {scale:.6f}")
+    return q.astype(np.int8), scale
 
 
-def save_to_json(embeddings, output_path):
-    """Save embeddings to JSON format for the web app."""
+def save_to_json(words, vectors, scale, output_path):
+    """Save int8 embeddings and their scale to JSON format for the web app."""
     print(f"Saving to {output_path}...")
 
-    # Convert to the format expected by the web app
-    words = list(embeddings.keys())
-    vectors = [embeddings[word] for word in words]
-
+    # Convert to the format expected by the web app: the int8 matrix is
+    # shipped row-major as one base64 blob, dequantized by multiplying by scale.
+    # Rows are unit length, so similarity is a plain dot product
     data = {
         "words": words,
-        "vectors": vectors
+        "vectors_b64": base64.b64encode(vectors.tobytes()).decode('ascii'),
+        "shape": list(vectors.shape),
+        "scale": scale
     }
 
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with open(output_path, 'w') as f:
         json.dump(data, f, separators=(',', ':'))  # Compact JSON
 
     # Calculate file size
@@ -435,26 +1032,23 @@ def verify_output(output_path):
     """Verify the output file can be loaded correctly."""
     print("Verifying output...")
 
-    with open(output_path, 'r', encoding='utf-8') as f:
+    with open(output_path, 'r') as f:
         data = json.load(f)
 
     words = data['words']
-    vectors = data['vectors']
+    vectors = np.frombuffer(base64.b64decode(data['vectors_b64']), dtype=np.int8)
+    vectors = vectors.reshape(data['shape']) * data['scale']
 
     print(f"  Words count: {len(words):,}")
     print(f"  Vectors count: {len(vectors):,}")
     print(f"  Vector dimensions: {len(vectors[0])}")
     print(f"  Sample words: {words[:10]}")
 
-    # Quick sanity check on a similarity
-    def cosine_sim(a, b):
-        dot = sum(x * y for x, y in zip(a, b))
-        return dot  # Vectors are already normalized
-
-    if 'king' in words and 'queen' in words:
-        king_idx = words.index('king')
-        queen_idx = words.index('queen')
-        similarity = cosine_sim(vectors[king_idx], vectors[queen_idx])
+    # Quick sanity check on a similarity. Vectors are unit length, so the
+    # dot product is the cosine
+    word2idx = {w: i for i, w in enumerate(words)}
+    if 'king' in word2idx and 'queen' in word2idx:
+        similarity = float(np.dot(vectors[word2idx['king']], vectors[word2idx['queen']]))
         print(f"  king-queen similarity: {similarity:.4f}")
 
     print("Verification complete!")
@@ -478,27 +1072,22 @@ def main():
 
     # Step 2: Load embeddings - only keep top 100k (GloVe is ~frequency sorted)
     # This makes deduplication fast since we're working with 100k not 1M words
-    embeddings = load_glove_embeddings(glove_path, max_words=150000)
+    words, vectors = load_glove_embeddings(glove_path, max_words=150000)
 
     # Step 3: Select top words FIRST to reduce deduplication work
-    embeddings = select_top_words(embeddings, TARGET_WORD_COUNT * 3)  # 45k words
-
-    # Step 4: Deduplicate by stem (fast O(n) approach)
-    embeddings = deduplicate_by_stem(embeddings)
-
-    # Step 5: Trim to final target count
-    embeddings = select_top_words(embeddings, TARGET_WORD_COUNT)
+    words, vectors = select_top_words(words, vectors, TARGET_WORD_COUNT * 3)  # 45k words
 
-    # Step 6: Normalize vectors
-    embeddings = normalize_vectors(embeddings)
+    # Step 4: Deduplicate by stem (fast O(n) approach), trimming to the
+    # final target count in the same pass
+    words, vectors = deduplicate_by_stem(words, vectors, max_words=TARGET_WORD_COUNT, cache_dir=data_dir)
 
-    # Step 7: Reduce precision for smaller file size
-    embeddings = reduce_precision(embeddings, decimal_places=4)
+    # Step 5: Quantize to int8 for smaller file size
+    vectors, scale = quantize_vectors(vectors)
 
-    # Step 8: Save to JSON
-    save_to_json(embeddings, output_path)
+    # Step 6: Save to JSON
+    save_to_json(words, vectors, scale, output_path)
 
-    # Step 9: Verify
+    # Step 7: Verify
     verify_output(output_path)
 
     print("\n" + "=" * 60)
@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback, useMemo } from 'react'
-import type { GameState, GuessResult } from '../types'
+import type { GameState, GuessResult, WordsFile } from '../types'
 import {
   getDailyWordIndex,
   getGameNumber,
@@ -8,6 +8,7 @@ import {
   saveGameState,
   loadGameState
 } from '../utils/gameLogic'
+import { decodeQuantizedVectors } from '../utils/similarity'
 
 interface WordData {
   words: string[]
@@ -50,15 +51,17 @@ export function useGame(): UseGameReturn {
 
       try {
         // Dynamic import - Vite will code-split this
-        const data = await import('../data/words.json')
+        const data = (await import('../data/words.json')) as unknown as WordsFile
 
         if (!cancelled) {
           setLoadingProgress('Processing...')
           // Small delay to show processing state
           await new Promise(resolve => setTimeout(resolve, 50))
           setWordData({
-            words: data.words as string[],
-            vectors: data.vectors as number[][]
+            words: data.words,
+            vectors: 'vectors_b64' in data
+              ? decodeQuantizedVectors(data.vectors_b64, data.shape, data.scale, data.dtype)
+              : data.vectors
           })
         }
       } catch (error) {
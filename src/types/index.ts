@@ -25,6 +25,20 @@ export interface WordEmbeddings {
   dimensions: number
 }
 
+// Contents of src/data/words.json: either plain float vectors, or int8
+// (default) or float16 vectors stored row-major as one base64 blob (multiply
+// by scale to decode). Vectors are unit length, so cosine similarity is just
+// the dot product
+export type WordsFile = { words: string[] } & (
+  | { vectors: number[][] }
+  | {
+      vectors_b64: string
+      shape: [number, number]
+      scale: number
+      dtype?: 'int8' | 'float16'
+    }
+)
+
 export interface VisualizationPoint {
   word: string
   x: number
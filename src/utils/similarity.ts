@@ -21,6 +21,51 @@ export function cosineSimilarity(a: number[], b: number[]): number {
   return dotProduct / (Math.sqrt(normA) * Math.sqrt(normB))
 }
 
+// Convert an IEEE 754 half-precision bit pattern to a number
+function halfToFloat(h: number): number {
+  const sign = h & 0x8000 ? -1 : 1
+  const exponent = (h >> 10) & 0x1f
+  const fraction = h & 0x3ff
+  if (exponent === 0) {
+    return sign * fraction * 2 ** -24 // Subnormal
+  }
+  if (exponent === 0x1f) {
+    return fraction ? NaN : sign * Infinity
+  }
+  return sign * (1 + fraction / 1024) * 2 ** (exponent - 15)
+}
+
+// Decode int8- or float16-encoded vectors (row-major, little-endian, base64)
+// back to floats
+export function decodeQuantizedVectors(
+  base64: string,
+  shape: [number, number],
+  scale: number,
+  dtype: 'int8' | 'float16' = 'int8'
+): number[][] {
+  const binary = atob(base64)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i)
+  }
+  const int8 = new Int8Array(bytes.buffer) // Wraps 128-255 to negative values
+
+  const [rows, dims] = shape
+  const vectors: number[][] = new Array(rows)
+  for (let r = 0; r < rows; r++) {
+    const row: number[] = new Array(dims)
+    for (let d = 0; d < dims; d++) {
+      const k = r * dims + d
+      row[d] = dtype === 'float16'
+        ? halfToFloat(bytes[2 * k] | (bytes[2 * k + 1] << 8)) * scale
+        : int8[k] * scale
+    }
+    vectors[r] = row
+  }
+
+  return vectors
+}
+
 // Euclidean distance between two vectors
 export function euclideanDistance(a: number[], b: number[]): number {
   if (a.length !== b.length) {
@@ -0,0 +1,64 @@
+import { test, expect } from '@playwright/test';
+import { decodeQuantizedVectors } from '../../src/utils/similarity';
+
+// Row-major bytes as they appear in words.json's vectors_b64
+function toBase64(bytes: number[]): string {
+  return Buffer.from(bytes).toString('base64');
+}
+
+test.describe('decodeQuantizedVectors', () => {
+  test('decodes signed int8 and applies the scale', () => {
+    const b64 = toBase64([0x7f, 0x81, 0x00, 0xff, 0x80, 0x01]);
+
+    const vectors = decodeQuantizedVectors(b64, [2, 3], 0.5);
+
+    expect(vectors).toEqual([
+      [63.5, -63.5, 0],
+      [-0.5, -64, 0.5],
+    ]);
+  });
+
+  test('treats a missing dtype as int8', () => {
+    const b64 = toBase64([0x3c, 0x00]);
+
+    expect(decodeQuantizedVectors(b64, [1, 2], 1, undefined)).toEqual([[60, 0]]);
+  });
+
+  test('decodes little-endian float16', () => {
+    const halves = [
+      0x3c00, // 1
+      0xbc00, // -1
+      0x3555, // 0.333251953125
+      0x7bff, // 65504, the largest finite half
+      0x0400, // 2^-14, the smallest normal
+      0x0001, // 2^-24, the smallest subnormal
+      0x83ff, // -(1023 * 2^-24), the largest negative subnormal
+      0x0000, // 0
+    ];
+    const b64 = toBase64(halves.flatMap(h => [h & 0xff, h >> 8]));
+
+    const vectors = decodeQuantizedVectors(b64, [2, 4], 1, 'float16');
+
+    expect(vectors).toEqual([
+      [1, -1, 0.333251953125, 65504],
+      [2 ** -14, 2 ** -24, -1023 * 2 ** -24, 0],
+    ]);
+  });
+
+  test('decodes float16 signed zero, infinity and NaN', () => {
+    const b64 = toBase64([0x00, 0x80, 0x00, 0x7c, 0x00, 0xfc, 0x01, 0x7e]);
+
+    const [row] = decodeQuantizedVectors(b64, [1, 4], 1, 'float16');
+
+    expect(Object.is(row[0], -0)).toBe(true);
+    expect(row[1]).toBe(Infinity);
+    expect(row[2]).toBe(-Infinity);
+    expect(row[3]).toBeNaN();
+  });
+
+  test('applies the scale to float16 values', () => {
+    const b64 = toBase64([0x00, 0x3c, 0x00, 0xc0]); // 1, -2
+
+    expect(decodeQuantizedVectors(b64, [1, 2], 0.25, 'float16')).toEqual([[0.25, -0.5]]);
+  });
+});